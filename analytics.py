@@ -23,6 +23,56 @@ class GestureAnalytics:
         
         print(f"📊 [LOG] {gesture} -> {device} {action}")
     
+    def write_gestures(self, events):
+        """과거 시점 기록으로 로그 파일을 새로 씀
+
+        events: [(datetime, gesture, device, action), ...]
+        """
+        self._rewrite(self._format(events))
+        print(f"📊 [LOG] {len(events)} gestures written to {self.log_file}")
+
+    def merge_gestures(self, events, windows=()):
+        """과거 시점 기록을 기존 로그와 시간순으로 합쳐 저장
+
+        events: [(datetime, gesture, device, action), ...]
+        windows: [(시작 datetime, 끝 datetime), ...] - 이 구간의 기존 기록은 지우고 events로 대체
+                 (같은 영상을 다시 처리해도 기록이 중복되지 않도록)
+        get_recent_logs()가 파일 순서를 시간 순서로 보기 때문에 뒤에 덧붙이지 않고 다시 씀
+        """
+        windows = [
+            (start.strftime('%Y-%m-%d %H:%M:%S'), end.strftime('%Y-%m-%d %H:%M:%S'))
+            for start, end in windows
+        ]
+
+        with open(self.log_file, 'r', newline='') as f:
+            rows = [
+                [row['timestamp'], row['gesture'], row['device'], row['action']]
+                for row in csv.DictReader(f)
+                if not any(start <= row['timestamp'] <= end for start, end in windows)
+            ]
+
+        rows.extend(self._format(events))
+
+        # 타임스탬프 형식이 사전순 = 시간순, 같은 시각은 기존 순서 유지
+        rows.sort(key=lambda row: row[0])
+        self._rewrite(rows)
+
+        print(f"📊 [LOG] {len(events)} gestures merged into {self.log_file}")
+
+    def _format(self, events):
+        return [
+            [timestamp.strftime('%Y-%m-%d %H:%M:%S'), gesture, device, action]
+            for timestamp, gesture, device, action in sorted(events, key=lambda event: event[0])
+        ]
+
+    def _rewrite(self, rows):
+        tmp_file = self.log_file + '.tmp'
+        with open(tmp_file, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['timestamp', 'gesture', 'device', 'action'])
+            writer.writerows(rows)
+        os.replace(tmp_file, self.log_file)
+
     def get_gesture_frequency(self):
         """제스처 사용 빈도"""
         gestures = []
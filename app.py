@@ -54,18 +54,7 @@ class GestureRecognitionThread(threading.Thread):
                     if gesture != "UNKNOWN" and recognizer.should_trigger_action(gesture):
                         print(f"\n[API] Gesture detected: {gesture}")
                         
-                        if gesture == "FIST":
-                            controller.toggle_light(False)
-                        elif gesture == "PALM":
-                            controller.toggle_light(True)
-                        elif gesture == "ONE_FINGER":
-                            controller.open_door()
-                        elif gesture == "PEACE":
-                            controller.close_door()
-                        elif gesture == "THREE_FINGERS":
-                            controller.play_music()
-                        elif gesture == "FOUR_FINGERS":
-                            controller.stop_music()
+                        controller.execute(gesture)
                         
                         # 상태 변경 후 출력
                         status = controller.get_status()
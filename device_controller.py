@@ -1,10 +1,25 @@
+from collections import namedtuple
+
 from arduino_controller import ArduinoController
 from analytics import GestureAnalytics
 
+# device/action/logged_gesture: 로그에 기록되는 값, method/args: 실행할 DeviceController 메서드
+GestureAction = namedtuple('GestureAction', ['device', 'action', 'logged_gesture', 'method', 'args'])
+
+# 제스처 -> 동작 표 (execute, 로그 기록, 녹화 영상 처리(video_ingest.py)가 모두 이 표를 사용)
+GESTURE_ACTIONS = {
+    "FIST": GestureAction("LIGHT", "OFF", "FIST", "toggle_light", (False,)),
+    "PALM": GestureAction("LIGHT", "ON", "PALM", "toggle_light", (True,)),
+    "ONE_FINGER": GestureAction("DOOR", "OPEN", "ONE_FINGER", "open_door", ()),
+    "PEACE": GestureAction("DOOR", "CLOSED", "PEACE", "close_door", ()),
+    "THREE_FINGERS": GestureAction("MUSIC", "PLAY", "THUMBS_UP", "play_music", ()),
+    "FOUR_FINGERS": GestureAction("MUSIC", "STOP", "THUMBS_DOWN", "stop_music", ()),
+}
+
 class DeviceController:
-    def __init__(self, arduino_port=None):
+    def __init__(self, arduino_port=None, log_file='gesture_log.csv'):
         self.arduino = ArduinoController(arduino_port)
-        self.analytics = GestureAnalytics()  # 분석 객체
+        self.analytics = GestureAnalytics(log_file)  # 분석 객체 (방마다 별도 로그)
 
         # 디바이스 상태
         self.light_on = False
@@ -26,7 +41,7 @@ class DeviceController:
         print(f"💡 Light: {status}")
 
         gesture = "FIST" if not turn_on else "PALM"
-        self.analytics.log_gesture(gesture, "LIGHT", status)
+        self._log(gesture, status)
 
         return status
     
@@ -42,7 +57,7 @@ class DeviceController:
         
         print(f"🚪 Door: OPEN")
 
-        self.analytics.log_gesture("ONE_FINGER", "DOOR", "OPEN")
+        self._log("ONE_FINGER")
 
         return "OPEN"
     
@@ -58,7 +73,7 @@ class DeviceController:
         
         print(f"🚪 Door: CLOSED")
 
-        self.analytics.log_gesture("PEACE", "DOOR", "CLOSED")
+        self._log("PEACE")
 
         return "CLOSED"
     
@@ -74,7 +89,7 @@ class DeviceController:
         
         print(f"🎵 Music: PLAYING")
 
-        self.analytics.log_gesture("THUMBS_UP", "MUSIC", "PLAY")
+        self._log("THREE_FINGERS")
 
         return "PLAYING"
     
@@ -90,10 +105,23 @@ class DeviceController:
         
         print(f"🎵 Music: STOPPED")
 
-        self.analytics.log_gesture("THUMBS_DOWN", "MUSIC", "STOP")
+        self._log("FOUR_FINGERS")
 
         return "STOPPED"
     
+    def execute(self, gesture):
+        """제스처에 따른 디바이스 동작 실행 (표에 없는 제스처는 무시)"""
+        gesture_action = GESTURE_ACTIONS.get(gesture)
+        if gesture_action:
+            getattr(self, gesture_action.method)(*gesture_action.args)
+
+    def _log(self, gesture, action=None):
+        """GESTURE_ACTIONS 표 기준으로 제스처 기록"""
+        gesture_action = GESTURE_ACTIONS[gesture]
+        self.analytics.log_gesture(
+            gesture_action.logged_gesture, gesture_action.device, action or gesture_action.action
+        )
+
     def get_status(self):
         """현재 모든 디바이스 상태 반환"""
         return {
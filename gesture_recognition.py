@@ -4,10 +4,11 @@ import time
 from device_controller import DeviceController
 
 class GestureRecognizer:
-    def __init__(self):
+    def __init__(self, static_image_mode=False):
         self.mp_hands = mp.solutions.hands
         self.mp_drawing = mp.solutions.drawing_utils
         self.hands = self.mp_hands.Hands(
+            static_image_mode=static_image_mode,
             max_num_hands=1,
             min_detection_confidence=0.7,
             min_tracking_confidence=0.7
@@ -66,8 +67,10 @@ class GestureRecognizer:
         
         return "UNKNOWN"
     
-    def should_trigger_action(self, current_gesture):
-        current_time = time.time()
+    def should_trigger_action(self, current_gesture, current_time=None):
+        # 녹화 영상 처리 시에는 영상 내 시간(초)을 넘겨받음
+        if current_time is None:
+            current_time = time.time()
         
         if current_gesture == self.last_gesture:
             if current_time - self.last_action_time < self.action_cooldown:
@@ -140,23 +143,7 @@ def main():
                         print(f"[GESTURE: {current_gesture}]")
                         print('='*40)
                         
-                        if current_gesture == "FIST":
-                            controller.toggle_light(False)  # LED OFF
-                            
-                        elif current_gesture == "PALM":
-                            controller.toggle_light(True)   # LED ON
-                            
-                        elif current_gesture == "ONE_FINGER":
-                            controller.open_door()          # 문 열기
-                            
-                        elif current_gesture == "PEACE":
-                            controller.close_door()         # 문 닫기
-                            
-                        elif current_gesture == "THREE_FINGERS":
-                            controller.play_music()         # 음악 재생 ⭐
-                            
-                        elif current_gesture == "FOUR_FINGERS":
-                            controller.stop_music()         # 음악 정지 ⭐
+                        controller.execute(current_gesture)
             
             cv2.imshow('Smart Room Control', frame)
             
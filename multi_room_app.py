@@ -0,0 +1,137 @@
+import argparse
+import time
+
+from flask import Flask, jsonify
+from flask_cors import CORS
+
+from room_engine import RoomEngine
+
+app = Flask(__name__)
+CORS(app)
+
+# 전역 엔진 (main에서 설정 파일로 생성)
+engine = None
+
+
+def room_or_404(room_id):
+    """방 조회 - 없으면 (None, 404 응답)"""
+    room = engine.get_room(room_id)
+    if room is None:
+        return None, (jsonify({"error": f"Unknown room: {room_id}"}), 404)
+    return room, None
+
+
+@app.route('/')
+def index():
+    """API 정보"""
+    return jsonify({
+        "name": "Smart Room Gesture Control API (Multi-Room)",
+        "version": "2.0",
+        "rooms": list(engine.rooms.keys()),
+        "endpoints": {
+            "/api/rooms": "List rooms",
+            "/api/rooms/<id>/status": "Get device status of a room",
+            "/api/rooms/<id>/gesture": "Get current gesture of a room",
+            "/api/rooms/<id>/devices/<device>": "Get light/door/music status of a room",
+            "/api/rooms/<id>/analytics": "Get analytics of a room",
+            "/api/throughput": "Get aggregate inference throughput"
+        }
+    })
+
+
+@app.route('/api/rooms')
+def list_rooms():
+    """전체 방 목록 + 요약 상태"""
+    return jsonify({room_id: room.get_status() for room_id, room in engine.rooms.items()})
+
+
+@app.route('/api/rooms/<room_id>/status')
+def get_room_status(room_id):
+    """방 하나의 전체 디바이스 상태"""
+    room, error = room_or_404(room_id)
+    if error:
+        return error
+    return jsonify(room.get_status())
+
+
+@app.route('/api/rooms/<room_id>/gesture')
+def get_room_gesture(room_id):
+    """방 하나의 현재 제스처"""
+    room, error = room_or_404(room_id)
+    if error:
+        return error
+    return jsonify({
+        "room": room.id,
+        "gesture": room.current_gesture,
+        "timestamp": time.time()
+    })
+
+
+@app.route('/api/rooms/<room_id>/devices/<device>')
+def get_room_device(room_id, device):
+    """방 하나의 디바이스(light/door/music) 상태"""
+    room, error = room_or_404(room_id)
+    if error:
+        return error
+
+    status = room.controller.get_status()
+    if device not in status:
+        return jsonify({"error": f"Unknown device: {device}"}), 404
+    return jsonify(status[device])
+
+
+@app.route('/api/rooms/<room_id>/analytics')
+def get_room_analytics(room_id):
+    """방 하나의 사용자 행동 패턴 분석"""
+    room, error = room_or_404(room_id)
+    if error:
+        return error
+    return jsonify(room.controller.get_analytics())
+
+
+@app.route('/api/throughput')
+def get_throughput():
+    """전체 인식 처리량 (방별 + 합계)"""
+    return jsonify(engine.get_throughput())
+
+
+def main():
+    global engine
+
+    parser = argparse.ArgumentParser(description="다중 방 제스처 제어 API 서버")
+    parser.add_argument("--config", default="rooms.json", help="방 설정 파일 (rooms.example.json 참고)")
+    parser.add_argument("--port", type=int, default=5000)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🏠 Smart Room Gesture Control API Server (Multi-Room)")
+    print("=" * 60)
+
+    engine = RoomEngine.from_file(args.config)
+    print(f"\nStarting {len(engine.rooms)} rooms: {', '.join(engine.rooms)}")
+    engine.start()
+
+    # 카메라 스레드가 시작될 때까지 잠깐 대기
+    time.sleep(2)
+
+    print("\n✅ Server ready!")
+    print(f"📡 API running on http://0.0.0.0:{args.port}")
+    print("\nAvailable endpoints:")
+    for room_id in engine.rooms:
+        print(f"  - http://localhost:{args.port}/api/rooms/{room_id}/status")
+    print(f"  - http://localhost:{args.port}/api/throughput")
+    print("\n Press Ctrl+C to stop\n")
+    print("=" * 60)
+
+    try:
+        app.run(host='0.0.0.0', port=args.port, debug=False, use_reloader=False, threaded=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print("\n\n👋 Shutting down...")
+        engine.stop()
+        print("✅ Server stopped!")
+
+
+if __name__ == '__main__':
+    main()
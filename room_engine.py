@@ -0,0 +1,403 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import cv2
+
+from device_controller import DeviceController
+from gesture_recognition import GestureRecognizer
+
+
+class RateCounter:
+    """최근 window초 동안의 초당 처리 횟수"""
+    def __init__(self, window=5.0):
+        self.window = window
+        self.times = deque()
+        self.total = 0
+        self.lock = threading.Lock()
+
+    def tick(self):
+        now = time.time()
+        with self.lock:
+            self.times.append(now)
+            self.total += 1
+            self._trim(now)
+
+    def rate(self):
+        now = time.time()
+        with self.lock:
+            self._trim(now)
+            return len(self.times) / self.window
+
+    def _trim(self, now):
+        while self.times and now - self.times[0] > self.window:
+            self.times.popleft()
+
+
+def default_log_file(room_id):
+    return f"gesture_log_{room_id}.csv"
+
+
+class Room:
+    """카메라 1대 + 인식기 + 디바이스 컨트롤러로 구성된 방 하나"""
+    def __init__(self, room_id, camera, arduino_port=None, name=None,
+                 log_file=None, motion_threshold=0.02, active_seconds=3.0):
+        self.id = room_id
+        self.name = name or room_id
+        self.camera = camera
+        self.recognizer = GestureRecognizer()  # 방마다 쿨다운 상태 분리
+        self.controller = DeviceController(
+            arduino_port=arduino_port,
+            log_file=log_file or default_log_file(room_id)
+        )
+        self.current_gesture = "UNKNOWN"
+
+        # 움직임 감지 설정
+        self.motion_threshold = motion_threshold  # 변화 픽셀 비율
+        self.active_seconds = active_seconds      # 움직임/손 감지 후 우선순위 유지 시간
+        self.motion = 0.0
+        self.last_activity = 0.0
+        self._prev_small = None
+
+        # 최신 프레임 (캡처 스레드 -> 스케줄러)
+        self.frame = None
+        self.frame_seq = 0
+        self.processed_seq = 0
+        self.last_inference = 0.0
+        self.frame_lock = threading.Lock()
+        # 새 프레임 알림 - InferenceScheduler가 자신의 Condition을 넣어줌.
+        # 한 방은 스케줄러가 한 번에 한 워커에만 배정
+        self.frame_ready = None
+
+        self.capture_rate = RateCounter()
+        self.inference_rate = RateCounter()
+        self.camera_ok = False
+
+    def update_frame(self, frame):
+        """캡처된 프레임 저장 + 움직임 정도 계산"""
+        small = cv2.cvtColor(cv2.resize(frame, (160, 120)), cv2.COLOR_BGR2GRAY)
+        small = cv2.GaussianBlur(small, (5, 5), 0)
+
+        if self._prev_small is not None:
+            diff = cv2.absdiff(small, self._prev_small)
+            _, mask = cv2.threshold(diff, 25, 255, cv2.THRESH_BINARY)
+            self.motion = cv2.countNonZero(mask) / mask.size
+            if self.motion > self.motion_threshold:
+                self.last_activity = time.time()
+        self._prev_small = small
+
+        with self.frame_lock:
+            self.frame = frame
+            self.frame_seq += 1
+        self.capture_rate.tick()
+
+        if self.frame_ready is not None:
+            with self.frame_ready:
+                self.frame_ready.notify()
+
+    def has_new_frame(self):
+        return self.frame_seq != self.processed_seq
+
+    def is_active(self, now=None):
+        now = now or time.time()
+        return now - self.last_activity < self.active_seconds
+
+    def run_inference(self):
+        """최신 프레임 1장에 대해 제스처 인식 + 동작 실행"""
+        with self.frame_lock:
+            frame = self.frame
+            seq = self.frame_seq
+        if frame is None:
+            return
+
+        self.processed_seq = seq
+        self.last_inference = time.time()
+
+        frame = cv2.flip(frame, 1)
+        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        results = self.recognizer.hands.process(frame_rgb)
+        self.inference_rate.tick()
+
+        if results.multi_hand_landmarks:
+            # 손이 보이는 동안은 움직임이 적어도 우선순위 유지
+            self.last_activity = time.time()
+            for hand_landmarks in results.multi_hand_landmarks:
+                gesture = self.recognizer.recognize_gesture(hand_landmarks)
+                self.current_gesture = gesture
+
+                if gesture != "UNKNOWN" and self.recognizer.should_trigger_action(gesture):
+                    print(f"\n[{self.id}] Gesture detected: {gesture}")
+                    self.controller.execute(gesture)
+        else:
+            self.current_gesture = "UNKNOWN"
+
+    def get_status(self):
+        status = self.controller.get_status()
+        status['current_gesture'] = self.current_gesture
+        status['room'] = {
+            "id": self.id,
+            "name": self.name,
+            "camera_ok": self.camera_ok,
+            "active": self.is_active(),
+            "motion": round(self.motion, 4),
+            "capture_fps": round(self.capture_rate.rate(), 1),
+            "inference_fps": round(self.inference_rate.rate(), 1)
+        }
+        return status
+
+
+class CaptureThread(threading.Thread):
+    """방 하나의 카메라에서 계속 프레임만 읽어옴 (인식은 스케줄러가 담당)
+
+    카메라가 열리지 않거나 read()가 max_failures번 연속 실패하면 camera_ok=False로 두고
+    reopen_delay초마다 다시 열기를 시도함 (USB 카메라가 빠졌다 다시 꽂힌 경우 등)
+    """
+    def __init__(self, room, max_failures=30, reopen_delay=2.0):
+        super().__init__()
+        self.room = room
+        self.max_failures = max_failures
+        self.reopen_delay = reopen_delay
+        self.stopped = threading.Event()
+        self.daemon = True
+
+    def run(self):
+        print(f"🎥 [{self.room.id}] Camera thread starting...")
+
+        reported = False
+        while not self.stopped.is_set():
+            cap = cv2.VideoCapture(self.room.camera)
+            if not cap.isOpened():
+                cap.release()
+                self.room.camera_ok = False
+                if not reported:
+                    print(f"❌ [{self.room.id}] Camera not found: {self.room.camera}, retrying...")
+                    reported = True
+                self.stopped.wait(self.reopen_delay)
+                continue
+
+            reported = False
+            self.room.camera_ok = True
+            print(f"✅ [{self.room.id}] Camera opened")
+
+            try:
+                self._read_frames(cap)
+            finally:
+                # read() 도중에 다른 스레드가 release하지 않도록 이 스레드에서 직접 해제
+                cap.release()
+                self.room.camera_ok = False
+
+        print(f"🎥 [{self.room.id}] Camera thread stopped")
+
+    def _read_frames(self, cap):
+        """카메라가 끊기거나 종료될 때까지 프레임 읽기"""
+        failures = 0
+        while not self.stopped.is_set():
+            success, frame = cap.read()
+            if success:
+                failures = 0
+                self.room.update_frame(frame)
+                continue
+
+            failures += 1
+            if failures >= self.max_failures:
+                print(f"⚠️  [{self.room.id}] Camera read failed {failures} times, reopening...")
+                self.room.camera_ok = False
+                self.stopped.wait(self.reopen_delay)
+                return
+            self.stopped.wait(0.1)
+
+    def stop(self):
+        self.stopped.set()
+
+
+class InferenceScheduler:
+    """제한된 인식 처리량을 여러 방에 공평하게 분배
+
+    새 프레임이 있는 방 중에서 마지막 인식 이후 대기 시간이 가장 긴 방을 고르고,
+    최근 움직임(또는 손)이 감지된 방은 대기 시간에 active_weight배 가중치를 줌.
+    대기 시간은 계속 늘어나므로 조용한 방도 굶지 않음.
+    """
+    def __init__(self, rooms, workers=1, active_weight=4.0, max_fps=None):
+        self.rooms = rooms
+        self.workers = workers
+        self.active_weight = active_weight
+        self.min_interval = 1.0 / max_fps if max_fps else 0  # 전체 인식 속도 상한
+        self.running = True
+        self.threads = []
+        # 새 프레임이 들어오면 대기 중인 워커를 깨우도록 모든 방에 같은 Condition을 넣어줌
+        self.condition = threading.Condition()
+        for room in rooms:
+            room.frame_ready = self.condition
+        self.busy = set()
+        self.last_dispatch = 0.0
+        self.rate = RateCounter()
+
+    def pick_room(self):
+        """다음에 인식할 방 선택 (없으면 None)"""
+        now = time.time()
+        best, best_score = None, -1.0
+
+        for room in self.rooms:
+            if room.id in self.busy or not room.has_new_frame():
+                continue
+            score = now - room.last_inference
+            if room.is_active(now):
+                score *= self.active_weight
+            if score > best_score:
+                best, best_score = room, score
+
+        return best
+
+    def _next_room(self):
+        """인식할 방이 생길 때까지 대기 (종료되면 None)"""
+        with self.condition:
+            while self.running:
+                wait = self.last_dispatch + self.min_interval - time.time()
+                if wait > 0:
+                    self.condition.wait(wait)  # max_fps 상한
+                    continue
+
+                room = self.pick_room()
+                if room:
+                    self.busy.add(room.id)
+                    self.last_dispatch = time.time()
+                    return room
+
+                self.condition.wait()  # 새 프레임 또는 종료 알림까지
+        return None
+
+    def _worker(self):
+        while True:
+            room = self._next_room()
+            if room is None:
+                return
+
+            try:
+                room.run_inference()
+                self.rate.tick()
+            except Exception as e:
+                print(f"❌ [{room.id}] Inference failed: {e}")
+            finally:
+                with self.condition:
+                    self.busy.discard(room.id)
+                    self.condition.notify()
+
+    def start(self):
+        for _ in range(self.workers):
+            thread = threading.Thread(target=self._worker, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self):
+        """워커 종료 - 실행 중인 인식/디바이스 동작이 끝날 때까지 기다림"""
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        for thread in self.threads:
+            thread.join()
+
+
+def validate_config(config):
+    """방 설정 검사 - 시리얼 포트를 열기 전에 잘못된 설정을 거름"""
+    rooms = config.get('rooms')
+    if not rooms:
+        raise ValueError("config must define at least one room in 'rooms'")
+
+    ids, cameras, ports, log_files = set(), set(), set(), set()
+    for index, room_config in enumerate(rooms):
+        room_id = room_config.get('id')
+        if not room_id:
+            raise ValueError(f"rooms[{index}] has no 'id'")
+        if room_id in ids:
+            raise ValueError(f"Duplicate room id: {room_id}")
+        ids.add(room_id)
+
+        camera = room_config.get('camera', 0)
+        if camera in cameras:
+            raise ValueError(f"Room '{room_id}': camera {camera} is already used by another room")
+        cameras.add(camera)
+
+        port = room_config.get('arduino_port')
+        if port:
+            if port in ports:
+                raise ValueError(f"Room '{room_id}': arduino_port {port} is already used by another room")
+            ports.add(port)
+
+        # 같은 로그 파일을 쓰면 방별 기록이 섞임
+        log_file = os.path.abspath(room_config.get('log_file') or default_log_file(room_id))
+        if log_file in log_files:
+            raise ValueError(f"Room '{room_id}': log_file {log_file} is already used by another room")
+        log_files.add(log_file)
+
+
+class RoomEngine:
+    """설정 파일 기반 다중 방 엔진"""
+    def __init__(self, config):
+        validate_config(config)
+
+        self.rooms = {}
+        for room_config in config['rooms']:
+            room = Room(
+                room_id=room_config['id'],
+                camera=room_config.get('camera', 0),
+                arduino_port=room_config.get('arduino_port'),
+                name=room_config.get('name'),
+                log_file=room_config.get('log_file'),
+                motion_threshold=room_config.get('motion_threshold', 0.02),
+                active_seconds=room_config.get('active_seconds', 3.0)
+            )
+            self.rooms[room.id] = room
+
+        scheduler_config = config.get('scheduler', {})
+        self.scheduler = InferenceScheduler(
+            list(self.rooms.values()),
+            workers=scheduler_config.get('workers', 1),
+            active_weight=scheduler_config.get('active_weight', 4.0),
+            max_fps=scheduler_config.get('max_fps')
+        )
+        self.capture_threads = []
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def get_room(self, room_id):
+        return self.rooms.get(room_id)
+
+    def start(self):
+        for room in self.rooms.values():
+            thread = CaptureThread(room)
+            thread.start()
+            self.capture_threads.append(thread)
+        self.scheduler.start()
+
+    def stop(self):
+        # 인식 워커가 모두 끝난 뒤에 시리얼 포트를 닫음
+        self.scheduler.stop()
+        for thread in self.capture_threads:
+            thread.stop()
+        for thread in self.capture_threads:
+            thread.join(timeout=2)  # 카메라가 멈춰 read()가 안 돌아오면 데몬 스레드로 남김
+        for room in self.rooms.values():
+            room.controller.close()
+
+    def get_throughput(self):
+        """전체 처리량 (방별 + 합계)"""
+        rooms = {}
+        for room in self.rooms.values():
+            rooms[room.id] = {
+                "capture_fps": round(room.capture_rate.rate(), 1),
+                "inference_fps": round(room.inference_rate.rate(), 1),
+                "inferences_total": room.inference_rate.total,
+                "active": room.is_active()
+            }
+        return {
+            "rooms": rooms,
+            "total_capture_fps": round(sum(r.capture_rate.rate() for r in self.rooms.values()), 1),
+            "total_inference_fps": round(self.scheduler.rate.rate(), 1),
+            "inferences_total": self.scheduler.rate.total,
+            "workers": self.scheduler.workers
+        }
@@ -0,0 +1,92 @@
+import csv
+import sys
+import types
+from datetime import datetime, timedelta
+
+# cv2/mediapipe/pyserial이 없는 환경에서도 순수 로직만 검사할 수 있도록 빈 모듈로 대체
+for name in ('cv2', 'mediapipe', 'serial'):
+    try:
+        __import__(name)
+    except ImportError:
+        sys.modules[name] = types.ModuleType(name)
+
+from analytics import GestureAnalytics
+from gesture_recognition import GestureRecognizer
+import video_ingest
+
+
+def make_recognizer():
+    """MediaPipe 그래프 없이 쿨다운 상태만 가진 인식기"""
+    recognizer = GestureRecognizer.__new__(GestureRecognizer)
+    recognizer.last_gesture = None
+    recognizer.last_action_time = 0
+    recognizer.action_cooldown = 0.8
+    return recognizer
+
+
+def test_split_segments_covers_all_frames():
+    segments = video_ingest.split_segments("a.mp4", 30.0, 2000, 30)
+
+    assert segments[0] == ("a.mp4", 30.0, 0, 900)
+    assert segments[-1] == ("a.mp4", 30.0, 1800, 2000)
+    # 구간이 겹치거나 비는 프레임 없이 이어짐
+    for (_, _, _, end), (_, _, start, _) in zip(segments, segments[1:]):
+        assert end == start
+
+
+def test_split_segments_unknown_frame_count_reads_to_eof():
+    assert video_ingest.split_segments("a.webm", 30.0, 0, 30) == [("a.webm", 30.0, 0, None)]
+
+
+def test_merge_detections_orders_segments_and_applies_cooldown():
+    start = datetime(2025, 1, 1, 9, 0, 0)
+    # 구간 결과는 완료 순서대로 들어오므로 뒤죽박죽
+    segment_results = [
+        (900, [(30.0, "PALM"), (30.5, "PALM"), (31.0, "PALM")]),
+        (0, [(1.0, "FIST"), (1.3, "FIST"), (2.0, "UNKNOWN"), (29.9, "PALM")]),
+    ]
+
+    events = video_ingest.merge_detections(make_recognizer(), segment_results, start, 0.8)
+
+    assert [(e[0] - start).total_seconds() for e in events] == [1.0, 29.9, 31.0]
+    assert [e[1:] for e in events] == [
+        ("FIST", "LIGHT", "OFF"),
+        ("PALM", "LIGHT", "ON"),
+        ("PALM", "LIGHT", "ON"),
+    ]
+
+
+def test_merge_detections_uses_live_log_names():
+    start = datetime(2025, 1, 1, 9, 0, 0)
+    events = video_ingest.merge_detections(
+        make_recognizer(), [(0, [(1.0, "THREE_FINGERS"), (2.0, "FOUR_FINGERS")])], start, 0.8
+    )
+
+    assert [e[1] for e in events] == ["THUMBS_UP", "THUMBS_DOWN"]
+
+
+def test_merge_gestures_replaces_ingested_window(tmp_path):
+    log_file = str(tmp_path / "log.csv")
+    analytics = GestureAnalytics(log_file)
+    start = datetime(2025, 1, 1, 9, 0, 0)
+    window = (start, start + timedelta(minutes=10))
+    events = [(start + timedelta(minutes=1), "PALM", "LIGHT", "ON")]
+
+    analytics.write_gestures([(start - timedelta(hours=1), "FIST", "LIGHT", "OFF"),
+                              (start + timedelta(hours=1), "PEACE", "DOOR", "CLOSED")])
+    # 같은 영상을 두 번 합쳐도 중복되지 않음
+    analytics.merge_gestures(events, [window])
+    analytics.merge_gestures(events, [window])
+
+    with open(log_file, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert [row['timestamp'] for row in rows] == [
+        '2025-01-01 08:00:00', '2025-01-01 09:01:00', '2025-01-01 10:00:00'
+    ]
+
+
+def test_scaling_table_efficiency_is_relative_to_one_worker():
+    table = video_ingest.scaling_table([(1, 10.0), (2, 20.0), (4, 36.0)])
+
+    assert [round(row[2], 2) for row in table] == [1.0, 2.0, 3.6]
+    assert [round(row[3], 2) for row in table] == [1.0, 1.0, 0.9]
@@ -0,0 +1,399 @@
+import argparse
+import multiprocessing
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+import cv2
+
+from analytics import GestureAnalytics
+from device_controller import GESTURE_ACTIONS
+from gesture_recognition import GestureRecognizer
+
+
+def available_cores():
+    """이 프로세스가 쓸 수 있는 코어 목록 (cgroup/컨테이너 제한 반영)"""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _init_worker(cores, next_index):
+    """워커 프로세스 초기화 - 프로세스 하나가 코어 하나만 쓰도록 제한
+
+    OpenCV/FFmpeg 스레드는 직접 끌 수 있지만 MediaPipe(TFLite)는 스레드 수 설정이 없어서
+    CPU affinity로 워커마다 코어 하나에 고정함 (리눅스/라즈베리파이).
+    워커 수는 코어 수 이하로 제한되므로 워커마다 서로 다른 코어가 배정됨
+    """
+    cv2.setNumThreads(1)
+
+    with next_index.get_lock():
+        index = next_index.value
+        next_index.value += 1
+
+    if hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {cores[index]})
+
+
+def open_video(path):
+    """FFmpeg 디코딩 스레드를 1개로 제한해서 영상 열기"""
+    cap = cv2.VideoCapture(path, cv2.CAP_FFMPEG, [cv2.CAP_PROP_N_THREADS, 1])
+    if not cap.isOpened():
+        raise IOError(f"Cannot open video: {path}")
+    return cap
+
+
+def probe_video(path):
+    """영상의 FPS와 전체 프레임 수 반환 (프레임 수를 모르면 0)"""
+    cap = open_video(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    frame_count = max(0, int(cap.get(cv2.CAP_PROP_FRAME_COUNT)))
+    cap.release()
+    return fps, frame_count
+
+
+def split_segments(path, fps, frame_count, segment_seconds):
+    """영상을 (path, fps, 시작 프레임, 끝 프레임) 구간으로 분할
+
+    프레임 수를 알 수 없는 영상(스트림, 일부 webm)은 끝 프레임 None = 끝까지 읽는 구간 하나
+    """
+    if frame_count <= 0:
+        print(f"⚠️  {path}: unknown frame count, reading to EOF in a single segment")
+        return [(path, fps, 0, None)]
+
+    segment_frames = max(1, int(round(fps * segment_seconds)))
+    segments = []
+
+    for start in range(0, frame_count, segment_frames):
+        end = min(start + segment_frames, frame_count)
+        segments.append((path, fps, start, end))
+
+    return segments
+
+
+def seek(cap, path, start_frame):
+    """start_frame으로 이동 후 실제 위치 반환
+
+    CAP_PROP_POS_FRAMES 이동은 코덱에 따라 키프레임 단위로 어긋나므로 실제 위치를 다시 읽고,
+    앞쪽에 멈추면 grab()으로 건너뛰고 넘어가면 처음부터 순서대로 읽음
+    """
+    if start_frame == 0:
+        return cap, 0
+
+    cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+    position = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+
+    if position < 0 or position > start_frame:
+        cap.release()
+        cap = open_video(path)
+        position = 0
+
+    while position < start_frame and cap.grab():
+        position += 1
+
+    return cap, position
+
+
+def process_segment(path, fps, start_frame, end_frame, flip=True, frame_step=1):
+    """구간 하나를 디코딩하고 프레임별 제스처 인식
+
+    반환값: (path, start_frame, [(영상 내 시간(초), 제스처), ...], 마지막 프레임 시간(초),
+            처리 프레임 수, 소요 시간, pid)
+    """
+    started = time.perf_counter()
+    cap, frame_index = seek(open_video(path), path, start_frame)
+
+    # 구간마다 새 그래프 - 이전 구간/다른 영상의 추적 상태가 넘어오지 않도록.
+    # 프레임을 건너뛰면 연속 프레임이 아니므로 추적 대신 매 프레임 검출
+    recognizer = GestureRecognizer(static_image_mode=frame_step > 1)
+
+    detections = []
+    frames = 0
+    last_offset = 0.0
+
+    try:
+        while end_frame is None or frame_index < end_frame:
+            success, frame = cap.read()
+            if not success:
+                break
+
+            # 가변 프레임레이트 영상도 맞도록 실제 재생 시각 사용
+            msec = cap.get(cv2.CAP_PROP_POS_MSEC)
+            offset = msec / 1000 if msec > 0 else frame_index / fps
+            last_offset = offset
+
+            if (frame_index - start_frame) % frame_step == 0:
+                if flip:
+                    frame = cv2.flip(frame, 1)
+                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                results = recognizer.hands.process(frame_rgb)
+                frames += 1
+
+                if results.multi_hand_landmarks:
+                    for hand_landmarks in results.multi_hand_landmarks:
+                        gesture = recognizer.recognize_gesture(hand_landmarks)
+                        detections.append((offset, gesture))
+
+            frame_index += 1
+    finally:
+        recognizer.hands.close()
+        cap.release()
+
+    elapsed = time.perf_counter() - started
+    return path, start_frame, detections, last_offset, frames, elapsed, os.getpid()
+
+
+def detect(segments, workers, flip=True, frame_step=1):
+    """구간들을 프로세스 풀에서 병렬 처리
+
+    실패한 구간은 건너뛰고 나머지 결과는 유지
+    반환값: (영상별 결과, 영상별 마지막 시간, 워커별 프레임 수, 워커별 소요 시간, 전체 소요 시간, 실패 구간)
+    """
+    results = defaultdict(list)
+    durations = defaultdict(float)
+    worker_frames = defaultdict(int)
+    worker_seconds = defaultdict(float)
+    failed = []
+
+    # 워커마다 코어 하나씩 배정 (워커 순번 -> 코어)
+    cores = available_cores()[:workers]
+    next_index = multiprocessing.Value('i', 0)
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(cores, next_index)) as pool:
+        futures = {
+            pool.submit(process_segment, path, fps, s, e, flip, frame_step): (path, s, e)
+            for path, fps, s, e in segments
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            path, start_frame, end_frame = futures[future]
+            try:
+                _, _, detections, last_offset, frames, elapsed, pid = future.result()
+            except Exception as e:
+                print(f"\n❌ {path} [{start_frame}-{end_frame}] failed: {e}")
+                failed.append((path, start_frame, end_frame))
+                continue
+
+            results[path].append((start_frame, detections))
+            durations[path] = max(durations[path], last_offset)
+            worker_frames[pid] += frames
+            worker_seconds[pid] += elapsed
+            print(f"\r   {done}/{len(segments)} segments done", end="", flush=True)
+    wall = time.perf_counter() - started
+    print()
+
+    return results, durations, worker_frames, worker_seconds, wall, failed
+
+
+def merge_detections(recognizer, segment_results, start_time, cooldown):
+    """구간 결과를 시간순으로 합치고 실시간과 동일한 쿨다운 적용
+
+    반환값: [(datetime, 로그 제스처 이름, 디바이스, 동작), ...]
+    """
+    recognizer.last_gesture = None
+    recognizer.last_action_time = 0
+    recognizer.action_cooldown = cooldown
+
+    detections = sorted(d for _, segment in segment_results for d in segment)
+
+    events = []
+    for offset, gesture in detections:
+        if gesture not in GESTURE_ACTIONS:
+            continue
+        if not recognizer.should_trigger_action(gesture, current_time=offset):
+            continue
+
+        gesture_action = GESTURE_ACTIONS[gesture]
+        events.append((
+            start_time + timedelta(seconds=offset),
+            gesture_action.logged_gesture,
+            gesture_action.device,
+            gesture_action.action,
+        ))
+
+    return events
+
+
+def recording_start_time(path, duration, start=None):
+    """녹화 시작 시각 - 지정하지 않으면 파일 수정 시각(녹화 종료)에서 영상 길이를 뺌"""
+    if start:
+        return datetime.strptime(start, '%Y-%m-%d %H:%M:%S')
+
+    end_time = datetime.fromtimestamp(os.path.getmtime(path))
+    return end_time - timedelta(seconds=duration)
+
+
+def print_throughput(worker_frames, worker_seconds, wall, workers):
+    """워커별/코어별 처리 속도 출력, 전체 FPS 반환
+
+    workers: 실제 사용한 워커(= 코어) 수
+    """
+    total_frames = sum(worker_frames.values())
+    total_fps = total_frames / wall if wall else 0
+
+    for pid in sorted(worker_frames):
+        fps = worker_frames[pid] / worker_seconds[pid] if worker_seconds[pid] else 0
+        print(f"  worker {pid}: {worker_frames[pid]} frames, {fps:.1f} FPS")
+    print(f"  total: {total_frames} frames in {wall:.1f}s "
+          f"({total_fps:.1f} FPS, {total_fps / workers:.1f} FPS/core)")
+
+    return total_fps
+
+
+def prepare(videos, segment_seconds):
+    """영상 정보 확인 + 구간 분할"""
+    segments = []
+    lengths = {}
+    for path in videos:
+        try:
+            fps, frame_count = probe_video(path)
+        except IOError as e:
+            print(f"❌ {e}")
+            continue
+        lengths[path] = frame_count / fps
+        segments.extend(split_segments(path, fps, frame_count, segment_seconds))
+        print(f"🎞️  {path}: {frame_count or '?'} frames @ {fps:.1f} FPS")
+    return segments, lengths
+
+
+def worker_count(workers, segments):
+    """워커 수 결정 - 사용 가능한 코어 수와 구간 수를 넘지 않도록 제한"""
+    cores = len(available_cores())
+    if workers and workers > cores:
+        print(f"⚠️  {workers} workers requested but only {cores} cores available, using {cores}")
+    return max(1, min(workers or cores, cores, len(segments)))
+
+
+def ingest(videos, log_file='gesture_log_ingest.csv', workers=None, segment_seconds=30,
+           cooldown=0.8, flip=True, frame_step=1, start=None, merge=False):
+    """녹화 영상들을 병렬로 처리해 제스처 로그(CSV)에 기록
+
+    기본은 log_file을 새로 씀. merge=True면 기존 기록과 시간순으로 합치되,
+    처리한 영상의 녹화 시간대에 있던 기존 기록은 새 결과로 대체함
+    """
+    if start and len(videos) > 1:
+        raise ValueError("start can only be given for a single video")
+
+    segments, lengths = prepare(videos, segment_seconds)
+    workers = worker_count(workers, segments)
+    print(f"⚙️  {len(segments)} segments across {workers} workers")
+
+    results, durations, worker_frames, worker_seconds, wall, failed = detect(
+        segments, workers, flip, frame_step
+    )
+
+    recognizer = GestureRecognizer()
+    events = []
+    windows = []
+    for path, segment_results in results.items():
+        # 프레임 수를 모르는 영상은 실제로 읽은 길이 사용
+        duration = lengths[path] or durations[path]
+        start_time = recording_start_time(path, duration, start)
+        windows.append((start_time, start_time + timedelta(seconds=duration)))
+        events.extend(merge_detections(recognizer, segment_results, start_time, cooldown))
+    recognizer.hands.close()
+
+    analytics = GestureAnalytics(log_file)
+    if merge:
+        analytics.merge_gestures(events, windows)
+    else:
+        analytics.write_gestures(events)
+
+    print("=" * 60)
+    print_throughput(worker_frames, worker_seconds, wall, workers)
+    print(f"📊 {len(events)} gestures written to {log_file}")
+    if failed:
+        print(f"⚠️  {len(failed)} segments failed")
+    print("=" * 60)
+
+    return events
+
+
+def measure_scaling(videos, worker_counts, segment_seconds=30, flip=True, frame_step=1):
+    """워커 수별 처리 속도 비교 (로그는 기록하지 않음)
+
+    항상 워커 1개부터 측정해서, 워커 1개 속도 x 워커 수 대비 실제 속도를 efficiency로 표시
+    """
+    segments, _ = prepare(videos, segment_seconds)
+    counts = sorted({worker_count(n, segments) for n in [1, *worker_counts]})
+
+    rows = []
+    for workers in counts:
+        print(f"\n⚙️  {workers} workers")
+        _, _, worker_frames, worker_seconds, wall, _ = detect(segments, workers, flip, frame_step)
+        total_fps = print_throughput(worker_frames, worker_seconds, wall, workers)
+        rows.append((workers, total_fps))
+
+    print("=" * 60)
+    print("  workers | total FPS | speedup | efficiency")
+    for workers, total_fps, speedup, efficiency in scaling_table(rows):
+        print(f"  {workers:7d} | {total_fps:9.1f} | {speedup:6.2f}x | {efficiency:9.0%}")
+    print("=" * 60)
+
+
+def scaling_table(rows):
+    """[(워커 수, 전체 FPS), ...] -> [(워커 수, 전체 FPS, speedup, efficiency), ...]
+
+    첫 행(가장 적은 워커 수)의 워커당 FPS를 기준으로 계산
+    """
+    base_workers, base_fps = rows[0]
+    per_worker_fps = base_fps / base_workers
+
+    table = []
+    for workers, total_fps in rows:
+        speedup = total_fps / base_fps if base_fps else 0
+        efficiency = total_fps / (per_worker_fps * workers) if per_worker_fps else 0
+        table.append((workers, total_fps, speedup, efficiency))
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="녹화 영상에서 제스처를 추출해 로그로 저장")
+    parser.add_argument("videos", nargs="+", help="입력 영상 파일")
+    parser.add_argument("--log-file", default="gesture_log_ingest.csv",
+                        help="출력 CSV (GestureAnalytics 형식, 기본은 새로 씀)")
+    parser.add_argument("--merge", action="store_true",
+                        help="기존 로그와 시간순으로 합침 (영상 녹화 시간대의 기존 기록은 대체)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="워커 프로세스 수 (기본/최대: 사용 가능한 코어 수)")
+    parser.add_argument("--segment-seconds", type=float, default=30, help="구간 길이(초)")
+    parser.add_argument("--cooldown", type=float, default=0.8, help="같은 제스처 반복 인식 간격(초)")
+    parser.add_argument("--frame-step", type=int, default=1, help="N 프레임마다 한 번 인식")
+    parser.add_argument("--no-flip", action="store_true", help="좌우 반전 없이 처리")
+    parser.add_argument("--start", default=None,
+                        help="녹화 시작 시각 'YYYY-MM-DD HH:MM:SS' (영상 1개일 때만)")
+    parser.add_argument("--scaling", default=None,
+                        help="워커 수별 처리 속도만 측정, 예: 1,2,4 (로그 기록 안 함)")
+    args = parser.parse_args()
+
+    if args.start and len(args.videos) > 1:
+        parser.error("--start can only be used with a single video")
+
+    if args.scaling:
+        measure_scaling(
+            args.videos,
+            [int(n) for n in args.scaling.split(",")],
+            segment_seconds=args.segment_seconds,
+            flip=not args.no_flip,
+            frame_step=max(1, args.frame_step),
+        )
+        return
+
+    ingest(
+        args.videos,
+        log_file=args.log_file,
+        workers=args.workers,
+        segment_seconds=args.segment_seconds,
+        cooldown=args.cooldown,
+        flip=not args.no_flip,
+        frame_step=max(1, args.frame_step),
+        start=args.start,
+        merge=args.merge,
+    )
+
+
+if __name__ == "__main__":
+    main()